@@ -25,11 +25,18 @@ class Controller:
         """
         Check if the task is interactive and add to appropriate queue
         """
-        interactive = task["interactive"]
-        if interactive:
-            self._input_queue.add(task)
-        else:
-            self._threadpool.add(task, self)
+        self.add_many([task])
+
+    def add_many(self, tasks):
+        """
+        Add each task to the appropriate queue and notify once
+        """
+        for task in tasks:
+            interactive = task["interactive"]
+            if interactive:
+                self._input_queue.add(task)
+            else:
+                self._threadpool.add(task, self)
         with self.condition:
             self.condition.notify()
 
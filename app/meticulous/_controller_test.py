@@ -27,6 +27,26 @@ def test_add():
     assert input_queue.pop() == task  # noqa=S101 # nosec
 
 
+def test_add_many():
+    """
+    Ensure a batch of interactive tasks are all added to the input queue
+    """
+    # Setup
+    input_queue = get_input_queue()
+    handlers = {}
+    threadpool = get_pool(handlers)
+    controller = Controller(
+        handlers=handlers, input_queue=input_queue, threadpool=threadpool
+    )
+    task = {"interactive": True, "priority": 1}
+    nexttask = {"interactive": True, "priority": 2}
+    # Exercise
+    controller.add_many([nexttask, task])
+    # Verify
+    assert input_queue.pop() == task  # noqa=S101 # nosec
+    assert input_queue.pop() == nexttask  # noqa=S101 # nosec
+
+
 def test_save():
     """
     Ensure tasks added get saved
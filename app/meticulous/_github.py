@@ -2,14 +2,23 @@
 Handlers for checking existing forks and creating new ones.
 """
 
+import collections
+import functools
 import logging
+import random
+import time
 
 import github
+import requests
 from plumbum import local
 
 from meticulous._secrets import load_api_key
 from meticulous._storage import get_value, set_value
 
+API_URL = "https://api.github.com"
+
+PullRequest = collections.namedtuple("PullRequest", ["number", "html_url"])
+
 
 def get_api():
     """
@@ -18,6 +27,99 @@ def get_api():
     return github.Github(load_api_key())
 
 
+@functools.lru_cache(maxsize=None)
+def get_session():
+    """
+    Shared HTTP session so direct API calls reuse the same connection
+    """
+    session = requests.Session()
+    session.headers.update(
+        {
+            "Authorization": f"token {load_api_key()}",
+            "Accept": "application/vnd.github.v3+json",
+        }
+    )
+    return session
+
+
+@functools.lru_cache(maxsize=None)
+def get_user_login():
+    """
+    Look up the login of the authenticated user once
+    """
+    return get_api().get_user().login
+
+
+def api_post(path, payload):
+    """
+    Post Json to the REST API raising GithubException on failure in the
+    same way as PyGithub
+    """
+    response = get_session().post(f"{API_URL}{path}", json=payload, timeout=120)
+    try:
+        data = response.json()
+    except ValueError:
+        data = response.text
+    if response.status_code >= 400:
+        raise github.GithubException(response.status_code, data, response.headers)
+    return data
+
+
+def retry_on_rate_limit(max_attempts=4, retry_server_errors=False):
+    """
+    Retry API calls that were throttled by rate limits, and server errors
+    only if requested as a retry may repeat a call that already succeeded
+    """
+
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            attempt = 1
+            while True:
+                try:
+                    return func(*args, **kwargs)
+                except github.GithubException as exc:
+                    delay = get_retry_delay(exc, attempt, retry_server_errors)
+                    if delay is None or attempt >= max_attempts:
+                        raise
+                    logging.warning(
+                        "API call failed with %s, retrying in %.1fs", exc.status, delay
+                    )
+                    time.sleep(delay)
+                    attempt += 1
+
+        return wrapper
+
+    return decorator
+
+
+def get_retry_delay(exc, attempt, retry_server_errors=False):
+    """
+    Seconds to wait before retrying a failed API call or None if the failure
+    is not transient
+    """
+    raw_headers = getattr(exc, "headers", None) or {}
+    headers = {key.lower(): value for key, value in raw_headers.items()}
+    jitter = random.uniform(0, 1)  # noqa: S311,DUO102 # nosec
+    backoff = 2 ** attempt + jitter
+    if exc.status in (403, 429):
+        if "retry-after" in headers:
+            seconds = float(headers["retry-after"])
+        elif headers.get("x-ratelimit-remaining") == "0":
+            reset = headers.get("x-ratelimit-reset")
+            if reset is None:
+                return backoff
+            seconds = float(reset) - time.time()
+        elif exc.status == 429:
+            return backoff
+        else:
+            return None
+        return min(max(seconds, 0), 60) + jitter
+    if exc.status >= 500 and retry_server_errors:
+        return backoff
+    return None
+
+
 def check_forked(orgrepo):
     """
     Check cache to check for an existing fork
@@ -113,13 +215,14 @@ def issues_allowed(reponame):
     return repo.has_issues
 
 
+@functools.lru_cache(maxsize=256)
 def get_parent_repo(reponame):
     """
     Get the furthest ancestor repository that is not
-    archived.
+    archived. Cached per repository name to save API calls.
     """
     api = get_api()
-    user_org = api.get_user().login
+    user_org = get_user_login()
     orgrepo = f"{user_org}/{reponame}"
     try:
         repo = api.get_repo(orgrepo)
@@ -140,18 +243,38 @@ def get_true_orgrepo(orgrepo):
     return repo.full_name
 
 
-def create_pr(reponame, title, body, from_branch, to_branch):
+@retry_on_rate_limit(max_attempts=4, retry_server_errors=True)
+def create_pr(
+    reponame, title, body, from_branch, to_branch, repo=None
+):  # pylint: disable=too-many-arguments
     """
-    Use API to create a pull request
+    Use API to create a pull request, optionally reusing an already
+    looked up parent repository
     """
-    api = get_api()
-    repo = get_parent_repo(reponame)
-    user_org = api.get_user().login
-    repo = get_parent_repo(reponame)
-    pullreq = repo.create_pull(
-        title=title, body=body, base=to_branch, head=f"{user_org}:{from_branch}"
+    if repo is None:
+        repo = get_parent_repo(reponame)
+    pullreq = api_post(
+        f"/repos/{repo.full_name}/pulls",
+        {
+            "title": title,
+            "body": body,
+            "base": to_branch,
+            "head": f"{get_user_login()}:{from_branch}",
+        },
     )
-    return pullreq
+    return PullRequest(number=pullreq["number"], html_url=pullreq["html_url"])
+
+
+@retry_on_rate_limit(max_attempts=4)
+def create_issue(reponame, title, body, repo=None):
+    """
+    Use API to create an issue returning its number, optionally reusing an
+    already looked up parent repository
+    """
+    if repo is None:
+        repo = get_parent_repo(reponame)
+    issue = api_post(f"/repos/{repo.full_name}/issues", {"title": title, "body": body})
+    return issue["number"]
 
 
 if __name__ == "__main__":
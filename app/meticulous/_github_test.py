@@ -0,0 +1,97 @@
+"""
+Test cases to check retrying of throttled API calls
+"""
+
+import time
+
+from github import GithubException
+
+from meticulous._github import get_retry_delay
+
+
+def test_forbidden_without_headers():
+    """
+    Ensure a plain permission failure is not retried
+    """
+    # Setup
+    exc = GithubException(403, "Forbidden", {"X-RateLimit-Remaining": "10"})
+    # Exercise
+    result = get_retry_delay(exc, 1)
+    # Verify
+    assert result is None  # noqa=S101 # nosec
+
+
+def test_forbidden_retry_after():
+    """
+    Ensure a secondary rate limit waits as long as requested
+    """
+    # Setup
+    exc = GithubException(403, "Forbidden", {"Retry-After": "30"})
+    # Exercise
+    result = get_retry_delay(exc, 1)
+    # Verify
+    assert 30 <= result <= 31  # noqa=S101 # nosec
+
+
+def test_forbidden_rate_limit_reset():
+    """
+    Ensure an exhausted rate limit waits until the reset capped at a minute
+    """
+    # Setup
+    reset = str(int(time.time()) + 3600)
+    headers = {"X-RateLimit-Remaining": "0", "X-RateLimit-Reset": reset}
+    exc = GithubException(403, "Forbidden", headers)
+    # Exercise
+    result = get_retry_delay(exc, 1)
+    # Verify
+    assert 60 <= result <= 61  # noqa=S101 # nosec
+
+
+def test_forbidden_rate_limit_no_reset():
+    """
+    Ensure an exhausted rate limit without a reset time backs off
+    """
+    # Setup
+    exc = GithubException(403, "Forbidden", {"X-RateLimit-Remaining": "0"})
+    # Exercise
+    result = get_retry_delay(exc, 2)
+    # Verify
+    assert 4 <= result <= 5  # noqa=S101 # nosec
+
+
+def test_too_many_requests():
+    """
+    Ensure too many requests is retried even without headers
+    """
+    # Setup
+    exc = GithubException(429, "Too Many Requests", {})
+    # Exercise
+    result = get_retry_delay(exc, 1)
+    # Verify
+    assert 2 <= result <= 3  # noqa=S101 # nosec
+
+
+def test_server_error():
+    """
+    Ensure server errors are only retried when requested
+    """
+    # Setup
+    exc = GithubException(502, "Bad Gateway", {})
+    # Exercise
+    retried = get_retry_delay(exc, 3, retry_server_errors=True)
+    not_retried = get_retry_delay(exc, 3)
+    # Verify
+    assert 8 <= retried <= 9  # noqa=S101 # nosec
+    assert not_retried is None  # noqa=S101 # nosec
+
+
+def test_not_found():
+    """
+    Ensure a missing resource is not retried
+    """
+    # Setup
+    exc = GithubException(404, "Not Found", {})
+    # Exercise
+    result = get_retry_delay(exc, 1, retry_server_errors=True)
+    # Verify
+    assert result is None  # noqa=S101 # nosec
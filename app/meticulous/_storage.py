@@ -7,6 +7,9 @@ import pathlib
 import sqlite3
 import threading
 
+_JSON_CACHE = {}
+_WRITES = {"count": 0}
+
 
 def prepare():
     """
@@ -39,6 +42,7 @@ def set_value(key, value):
     sql = "INSERT INTO config ( key, value ) VALUES (?, ?)"
     con.execute(sql, (key, value))
     con.commit()
+    _WRITES["count"] += 1
 
 
 def get_json_value(key, deflt=None):
@@ -50,6 +54,28 @@ def get_json_value(key, deflt=None):
     return json.loads(jsonval)
 
 
+def get_cached_json_value(key, deflt=None):
+    """
+    Load a Json value for the specified key, reusing the stored text while
+    the database has not been written to. The text is decoded on every call
+    so callers always get a fresh value they may modify.
+    """
+    dbpath = get_store_dir() / "sqlite.db"
+    try:
+        mtime_ns = dbpath.stat().st_mtime_ns
+    except FileNotFoundError:
+        mtime_ns = None
+    stamp = (mtime_ns, _WRITES["count"])
+    deflt = json.dumps(deflt)
+    cache_key = (key, deflt)
+    cached = _JSON_CACHE.get(cache_key)
+    if cached is not None and cached[0] == stamp:
+        return json.loads(cached[1])
+    jsonval = get_value(key, deflt=deflt)
+    _JSON_CACHE[cache_key] = (stamp, jsonval)
+    return json.loads(jsonval)
+
+
 def set_json_value(key, value):
     """
     Serialize and save a Json value
@@ -0,0 +1,45 @@
+"""
+Test cases to check stored values
+"""
+
+import pathlib
+import tempfile
+from unittest import mock
+
+from meticulous import _storage
+
+
+@mock.patch("meticulous._storage.get_store_dir")
+def test_cached_json_value(store_mock):
+    """
+    Ensure cached values are copies and are reloaded after a write
+    """
+    # Setup
+    store_mock.return_value = pathlib.Path(tempfile.mkdtemp())
+    _storage.prepare()
+    _storage.set_json_value("saves", {"repo": {"add_word": "the"}})
+    first = _storage.get_cached_json_value("saves", {})
+    first["repo"]["add_word"] = "changed"
+    # Exercise
+    unchanged = _storage.get_cached_json_value("saves", {})
+    _storage.set_json_value("saves", {"repo": {"add_word": "then"}})
+    updated = _storage.get_cached_json_value("saves", {})
+    # Verify
+    assert unchanged == {"repo": {"add_word": "the"}}  # noqa=S101 # nosec
+    assert updated == {"repo": {"add_word": "then"}}  # noqa=S101 # nosec
+
+
+@mock.patch("meticulous._storage.get_store_dir")
+def test_cached_json_default(store_mock):
+    """
+    Ensure the default for a missing key is not reused for another default
+    """
+    # Setup
+    store_mock.return_value = pathlib.Path(tempfile.mkdtemp())
+    _storage.prepare()
+    # Exercise
+    first = _storage.get_cached_json_value("missing", {})
+    second = _storage.get_cached_json_value("missing", [])
+    # Verify
+    assert first == {}  # noqa=S101 # nosec
+    assert second == []  # noqa=S101 # nosec
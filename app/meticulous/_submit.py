@@ -1,35 +1,119 @@
 """
 Main processing for meticulous
 """
+# Heavy dependencies are imported where used to keep module import fast.
+# pylint: disable=import-outside-toplevel
 from __future__ import absolute_import, division, print_function
 
+import collections
+import concurrent.futures
+import functools
 import io
+import logging
+import os
 import re
 import sys
 from pathlib import Path
 
-from github import GithubException
-from plumbum import FG, ProcessExecutionError, local
-
 from meticulous._exceptions import ProcessingFailed
-from meticulous._github import create_pr, get_parent_repo
 from meticulous._input import (
     UserCancel,
     get_confirmation,
     make_choice,
     make_simple_choice,
 )
-from meticulous._processrepo import add_repo_save
-from meticulous._storage import get_json_value
-from meticulous._summary import display_and_check_files
+from meticulous._storage import get_cached_json_value
+from meticulous._summary import check_files, display_and_check_files
 from meticulous._util import get_editor
 
+_WORD_RE = re.compile("[A-Za-z]+")
+
+RepoSave = collections.namedtuple(
+    "RepoSave", ["add_word", "del_word", "file_paths", "repodir", "files"]
+)
+
+_ISSUE_TMPL = Path(".github/ISSUE_TEMPLATE")
+_PR_TMPL = Path(".github/pull_request_template.md")
+_CONTRIB = Path("CONTRIBUTING.md")
+_TEMPLATE_PATHS = (_ISSUE_TMPL, _PR_TMPL, _CONTRIB)
+
+_PR_FILE = Path("__pr__.txt")
+_ISSUE_FILE = Path("__issue__.txt")
+_COMMIT_FILE = Path("__commit__.txt")
+_NO_ISSUES_FILE = Path("__no_issues__.txt")
+_WORK_PATHS = (_PR_FILE, _ISSUE_FILE, _COMMIT_FILE, _NO_ISSUES_FILE)
+
+_ISSUE_TITLE = "Fix simple typo: {del_word} -> {add_word}"
+
+_ISSUE_BODY_FULL = """\
+# Issue Type
+
+[x] Bug (Typo)
+
+# Steps to Replicate
+
+1. Examine {files}.
+2. Search for `{del_word}`.
+
+# Expected Behaviour
+
+1. Should read `{add_word}`.
+"""
+
+_ISSUE_BODY_SHORT = """\
+There is a small typo in {files}.
+Should read `{add_word}` rather than `{del_word}`.
+"""
+
+_COMMIT_TITLE = "docs: Fix simple typo, {del_word} -> {add_word}"
+
+_COMMIT_BODY = """\
+There is a small typo in {files}.
+
+Should read `{add_word}` rather than `{del_word}`.
+"""
+
+_CLOSING_COMMIT_BODY = """\
+There is a small typo in {files}.
+
+Closes #{issue_num}
+"""
+
+
+def load_repo_save(reposave):
+    """
+    Unpack a stored repository save once for the submission steps
+    """
+    file_paths = tuple(reposave["file_paths"])
+    return RepoSave(
+        add_word=reposave["add_word"],
+        del_word=reposave["del_word"],
+        file_paths=file_paths,
+        repodir=Path(reposave["repodir"]),
+        files=", ".join(file_paths),
+    )
+
+
+@functools.lru_cache(maxsize=None)
+def _git():
+    """
+    Resolve the git command once, importing plumbum on first use
+    """
+    from plumbum import local
+
+    return local["git"]
+
 
 def submit_handlers():
     """
     Obtain multithread task handlers for submission.
     """
-    return {"submit": submit, "plain_pr": plain_pr, "full_pr": full_pr}
+    return {
+        "submit": submit,
+        "submit_batch": submit_batch,
+        "plain_pr": plain_pr,
+        "full_pr": full_pr,
+    }
 
 
 def submit(context):
@@ -40,15 +124,15 @@ def submit(context):
 
     def handler():
         reponame = context.taskjson["reponame"]
-        repository_saves = get_json_value("repository_saves", {})
+        repository_saves = get_cached_json_value("repository_saves", {})
         if reponame in repository_saves:
             reposave = repository_saves[reponame]
-            suggest_plain = check_if_plain_pr(reposave)
-            add_word = reposave["add_word"]
-            del_word = reposave["del_word"]
-            file_paths = reposave["file_paths"]
-            files = ", ".join(file_paths)
-            print(f"Fix in {reponame}: {del_word} -> {add_word} over {files}")
+            save = load_repo_save(reposave)
+            suggest_plain = check_if_plain_pr(save)
+            print(
+                f"Fix in {reponame}: {save.del_word} -> {save.add_word}"
+                f" over {save.files}"
+            )
             if suggest_plain:
                 submit_plain = get_confirmation("Analysis suggests plain pr, agree?")
             else:
@@ -65,6 +149,33 @@ def submit(context):
     return handler
 
 
+def submit_batch(context):
+    """
+    Task to submit pull requests/issues for several repositories following
+    the analysis suggestion without confirmation
+    """
+
+    def handler():
+        repository_saves = get_cached_json_value("repository_saves", {})
+        tasks = []
+        for reponame in context.taskjson["reponames"]:
+            if reponame not in repository_saves:
+                continue
+            reposave = repository_saves[reponame]
+            suggest_issue = _suggests_issue(load_repo_save(reposave))
+            tasks.append(
+                {
+                    "name": "full_pr" if suggest_issue else "plain_pr",
+                    "interactive": False,
+                    "reponame": reponame,
+                    "reposave": reposave,
+                }
+            )
+        context.controller.add_many(tasks)
+
+    return handler
+
+
 def plain_pr(context):
     """
     Non-interactive task to finish off submission of a pr
@@ -72,7 +183,7 @@ def plain_pr(context):
 
     def handler():
         reponame = context.taskjson["reponame"]
-        reposave = context.taskjson["reposave"]
+        reposave = load_repo_save(context.taskjson["reposave"])
         plain_pr_for(reponame, reposave)
         add_cleanup(context, reponame)
 
@@ -86,7 +197,7 @@ def full_pr(context):
 
     def handler():
         reponame = context.taskjson["reponame"]
-        reposave = context.taskjson["reposave"]
+        reposave = load_repo_save(context.taskjson["reposave"])
         full_pr_for(reponame, reposave)
         add_cleanup(context, reponame)
 
@@ -107,8 +218,9 @@ def fast_prepare_a_pr_or_issue_for(reponame, reposave):
     Display a suggestion if the repository looks like it wants an issue and a
     pull request or is happy with just a pull request.
     """
-    if check_if_plain_pr(reposave):
-        plain_pr_for(reponame, reposave)
+    save = load_repo_save(reposave)
+    if not _suggests_issue(save):
+        plain_pr_for(reponame, save)
     else:
         prepare_a_pr_or_issue_for(reponame, reposave)
 
@@ -118,89 +230,147 @@ def check_if_plain_pr(reposave):
     Display a suggestion if the repository looks like it wants an issue and a
     pull request or is happy with just a pull request.
     """
-
-    repopath = Path(reposave["repodir"])
+    repopath = reposave.repodir
     suggest_issue = False
-    if display_and_check_files(repopath / ".github" / "ISSUE_TEMPLATE"):
-        suggest_issue = True
-    if display_and_check_files(repopath / ".github" / "pull_request_template.md"):
-        suggest_issue = True
-    if display_and_check_files(repopath / "CONTRIBUTING.md"):
-        suggest_issue = True
-    if not suggest_issue:
-        return True
-    return False
+    for path, has_path in zip(_TEMPLATE_PATHS, probe_templates(repopath)):
+        if has_path and display_and_check_files(repopath / path):
+            suggest_issue = True
+    return not suggest_issue
+
+
+def _suggests_issue(reposave):
+    """
+    Silently check if the repository looks like it wants an issue, stopping
+    at the first template that suggests one.
+    """
+    repopath = reposave.repodir
+    return any(
+        has_path and check_files(repopath / path)
+        for path, has_path in zip(_TEMPLATE_PATHS, probe_templates(repopath))
+    )
+
+
+def probe_templates(repodirpath):
+    """
+    Check which of the issue template, pr template and contributing guide
+    exist
+    """
+    return _scan_paths(str(repodirpath), _TEMPLATE_PATHS)
+
+
+def _scan_paths(repodir, paths):
+    """
+    Check which of the paths exist from a listing of each directory holding
+    them rather than a stat per path
+    """
+    listings = {}
+    for path in paths:
+        parent = str(path.parent)
+        if parent not in listings:
+            listings[parent] = _list_names(os.path.join(repodir, parent))
+    return tuple(path.name in listings[str(path.parent)] for path in paths)
+
+
+def _list_names(dirpath):
+    """
+    Names of the entries of a directory or empty if it does not exist
+    """
+    try:
+        with os.scandir(dirpath) as entries:
+            return {entry.name for entry in entries}
+    except (FileNotFoundError, NotADirectoryError):
+        return set()
 
 
 def plain_pr_for(reponame, reposave):
     """
     Create and submit the standard PR.
     """
-    make_a_commit(reponame, reposave, False)
-    non_interactive_submit_commit(reponame, reposave)
+    message = commit_message(reposave)
+    non_interactive_submit_commit(reponame, reposave, message=message)
 
 
 def full_pr_for(reponame, reposave):
     """
-    Create and submit the standard PR.
+    Create and submit the standard PR. The branch is pushed while the issue
+    is created and then amended to close the issue.
     """
-    make_issue(reponame, reposave, True)
-    submit_issue(reponame, reposave, None)
-    non_interactive_submit_commit(reponame, reposave)
+    from github import GithubException
+    from plumbum import ProcessExecutionError
+
+    from meticulous._github import get_parent_repo
+
+    try:
+        repo = get_parent_repo(reponame)
+        issue_num, pushed = issue_and_push(reponame, reposave, repo)
+    except ProcessExecutionError:
+        return f"Failed to commit for {reponame}."
+    except GithubException:
+        return f"Failed to create pr for {reponame}."
+    message = closing_commit_message(reposave, issue_num)
+    return non_interactive_submit_commit(
+        reponame, reposave, repo=repo, pushed=pushed, message=message
+    )
+
+
+def issue_and_push(reponame, reposave, repo):
+    """
+    Create the issue while committing and pushing the fix, undoing the push
+    if the issue could not be created
+    """
+    title, body = issue_message(reposave, True)
+    commit_text = format_commit_like(commit_message(reposave))
+    with concurrent.futures.ThreadPoolExecutor(max_workers=2) as executor:
+        issue_future = executor.submit(issue_via_api, reponame, title, body, repo)
+        push_future = executor.submit(
+            push_commit, reposave.repodir, reposave.add_word, commit_text
+        )
+        concurrent.futures.wait((issue_future, push_future))
+    if issue_future.exception() is not None and push_future.exception() is None:
+        undo_push(reposave.repodir, *push_future.result())
+    return issue_future.result(), push_future.result()
 
 
 def prepare_a_pr_or_issue_for(reponame, reposave):
     """
-    Access repository to prepare a change
+    Access repository to prepare a change, only working out the choices
+    again after a handler that may have changed the repository
     """
+    reposave = load_repo_save(reposave)
+    repodirpath = reposave.repodir
+    choices = None
     try:
         while True:
-            repodir = reposave["repodir"]
-            repodirpath = Path(repodir)
-            choices = get_pr_or_issue_choices(reponame, repodirpath)
+            if choices is None:
+                choices = get_pr_or_issue_choices(reponame, repodirpath)
             option = make_choice(choices)
             if option is None:
                 return
             handler, context = option
             handler(reponame, reposave, context)
+            if handler is not show_path:
+                choices = None
     except UserCancel:
         print("quit - returning to main process")
 
 
-def get_pr_or_issue_choices(reponame, repodirpath):  # pylint: disable=too-many-locals
+def get_pr_or_issue_choices(reponame, repodirpath):
     """
     Work out the choices menu for pr/issue
     """
-    issue_template = Path(".github") / "ISSUE_TEMPLATE"
-    pr_template = Path(".github") / "pull_request_template.md"
-    contrib_guide = Path("CONTRIBUTING.md")
-    issue = Path("__issue__.txt")
-    commit = Path("__commit__.txt")
-    prpath = Path("__pr__.txt")
-    no_issues = Path("__no_issues__.txt")
     choices = {}
-    paths = (
-        issue_template,
-        pr_template,
-        contrib_guide,
-        prpath,
-        issue,
-        commit,
-        no_issues,
-    )
-    for path in paths:
-        has_path = (repodirpath / path).exists()
+    paths = _TEMPLATE_PATHS + _WORK_PATHS
+    found = dict(zip(paths, _scan_paths(str(repodirpath), paths)))
+    for path, has_path in found.items():
         print(f"{reponame} {'HAS' if has_path else 'does not have'}" f" {path}")
         if has_path:
             choices[f"show {path}"] = (show_path, path)
     choices["make a commit"] = (make_a_commit, False)
     choices["make a full issue"] = (make_issue, True)
     choices["make a short issue"] = (make_issue, False)
-    has_issue = (repodirpath / issue).exists()
-    if has_issue:
+    if found[_ISSUE_FILE]:
         choices["submit issue"] = (submit_issue, None)
-    has_commit = (repodirpath / commit).exists()
-    if has_commit:
+    if found[_COMMIT_FILE]:
         choices["submit commit"] = (submit_commit, None)
         choices["submit issue"] = (submit_issue, None)
     return choices
@@ -210,94 +380,75 @@ def make_issue(reponame, reposave, is_full):  # pylint: disable=unused-argument
     """
     Prepare an issue template file
     """
-    add_word = reposave["add_word"]
-    del_word = reposave["del_word"]
-    file_paths = reposave["file_paths"]
-    repodir = Path(reposave["repodir"])
-    files = ", ".join(file_paths)
-    title = f"Fix simple typo: {del_word} -> {add_word}"
-    if is_full:
-        body = f"""\
-# Issue Type
+    repodir = reposave.repodir
+    write_commit_like_file(repodir / _ISSUE_FILE, issue_message(reposave, is_full))
 
-[x] Bug (Typo)
-
-# Steps to Replicate
 
-1. Examine {files}.
-2. Search for `{del_word}`.
+def issue_message(reposave, is_full):
+    """
+    Work out the title and body of an issue
+    """
+    fields = _template_fields(reposave)
+    template = _ISSUE_BODY_FULL if is_full else _ISSUE_BODY_SHORT
+    return _ISSUE_TITLE.format(**fields), template.format(**fields)
 
-# Expected Behaviour
 
-1. Should read `{add_word}`.
-"""
-    else:
-        body = f"""\
-There is a small typo in {files}.
-Should read `{add_word}` rather than `{del_word}`.
-"""
-    with io.open(str(repodir / "__issue__.txt"), "w", encoding="utf-8") as fobj:
-        print(title, file=fobj)
-        print("", file=fobj)
-        print(body, file=fobj)
+def _template_fields(reposave):
+    """
+    Values substituted into the issue and commit templates
+    """
+    return {
+        "add_word": reposave.add_word,
+        "del_word": reposave.del_word,
+        "files": reposave.files,
+    }
 
 
 def make_a_commit(reponame, reposave, is_full):  # pylint: disable=unused-argument
     """
     Prepare a commit template file
     """
-    add_word = reposave["add_word"]
-    del_word = reposave["del_word"]
-    file_paths = reposave["file_paths"]
-    repodir = Path(reposave["repodir"])
-    files = ", ".join(file_paths)
-    commit_path = str(repodir / "__commit__.txt")
-    with io.open(commit_path, "w", encoding="utf-8") as fobj:
-        print(
-            f"""\
-docs: Fix simple typo, {del_word} -> {add_word}
+    repodir = reposave.repodir
+    write_commit_like_file(repodir / _COMMIT_FILE, commit_message(reposave))
 
-There is a small typo in {files}.
 
-Should read `{add_word}` rather than `{del_word}`.
-""",
-            file=fobj,
-        )
+def commit_message(reposave):
+    """
+    Work out the title and body of the commit
+    """
+    fields = _template_fields(reposave)
+    return _COMMIT_TITLE.format(**fields), _COMMIT_BODY.format(**fields)
 
 
 def submit_issue(reponame, reposave, ctxt):  # pylint: disable=unused-argument
     """
-    Push up an issue
+    Push up an issue and prepare the commit template file that closes it
     """
-    repodir = Path(reposave["repodir"])
-    add_word = reposave["add_word"]
-    del_word = reposave["del_word"]
-    file_paths = reposave["file_paths"]
-    files = ", ".join(file_paths)
-    issue_path = str(repodir / "__issue__.txt")
+    repodir = reposave.repodir
+    issue_path = str(repodir / _ISSUE_FILE)
     title, body = load_commit_like_file(issue_path)
     issue_num = issue_via_api(reponame, title, body)
-    commit_path = str(repodir / "__commit__.txt")
-    with io.open(commit_path, "w", encoding="utf-8") as fobj:
-        print(
-            f"""\
-docs: Fix simple typo, {del_word} -> {add_word}
+    message = closing_commit_message(reposave, issue_num)
+    write_commit_like_file(repodir / _COMMIT_FILE, message)
 
-There is a small typo in {files}.
 
-Closes #{issue_num}
-""",
-            file=fobj,
-        )
+def closing_commit_message(reposave, issue_num):
+    """
+    Work out the title and body of a commit that closes the issue
+    """
+    fields = _template_fields(reposave)
+    body = _CLOSING_COMMIT_BODY.format(issue_num=issue_num, **fields)
+    return _COMMIT_TITLE.format(**fields), body
 
 
-def issue_via_api(reponame, title, body):
+def issue_via_api(reponame, title, body, repo=None):
     """
-    Create an issue via the API
+    Create an issue via the API, optionally reusing an already looked up
+    parent repository
     """
-    repo = get_parent_repo(reponame)
-    issue = repo.create_issue(title=title, body=body)
-    return issue.number
+    from meticulous._github import create_issue
+
+    return create_issue(reponame, title, body, repo=repo)
 
 
 def load_commit_like_file(path):
@@ -313,6 +464,21 @@ def load_commit_like_file(path):
     return title, body
 
 
+def write_commit_like_file(path, message):
+    """
+    Write title and body as a well formatted git commit
+    """
+    path.write_text(format_commit_like(message), encoding="utf-8")
+
+
+def format_commit_like(message):
+    """
+    Join title and body with a blank line as in a git commit
+    """
+    title, body = message
+    return f"{title}\n\n{body}"
+
+
 def submit_commit(reponame, reposave, ctxt):  # pylint: disable=unused-argument
     """
     Push up a commit and show message
@@ -320,17 +486,33 @@ def submit_commit(reponame, reposave, ctxt):  # pylint: disable=unused-argument
     print(non_interactive_submit_commit(reponame, reposave))
 
 
-def non_interactive_submit_commit(reponame, reposave):
+def non_interactive_submit_commit(
+    reponame, reposave, repo=None, pushed=None, message=None
+):  # pylint: disable=too-many-arguments
     """
-    Push up a commit
+    Push up a commit, if the branches have already been pushed the commit
+    is amended and pushed again instead. The commit title and body are read
+    from the commit template file unless given.
     """
+    from github import GithubException
+    from plumbum import ProcessExecutionError
+
+    from meticulous._github import create_pr
+
     try:
-        repodir = Path(reposave["repodir"])
-        add_word = reposave["add_word"]
-        commit_path = str(repodir / "__commit__.txt")
-        title, body = load_commit_like_file(commit_path)
-        from_branch, to_branch = push_commit(repodir, add_word)
-        pullreq = create_pr(reponame, title, body, from_branch, to_branch)
+        repodir = reposave.repodir
+        if message is None:
+            message = load_commit_like_file(str(repodir / _COMMIT_FILE))
+            commit_text = None
+        else:
+            commit_text = format_commit_like(message)
+        title, body = message
+        if pushed is None:
+            pushed = push_commit(repodir, reposave.add_word, commit_text)
+        else:
+            amend_commit(repodir, *pushed, commit_text)
+        from_branch, to_branch = pushed
+        pullreq = create_pr(reponame, title, body, from_branch, to_branch, repo=repo)
         return f"Created PR #{pullreq.number} view at {pullreq.html_url}"
     except ProcessExecutionError:
         return f"Failed to commit for {reponame}."
@@ -338,27 +520,70 @@ def non_interactive_submit_commit(reponame, reposave):
         return f"Failed to create pr for {reponame}."
 
 
-def push_commit(repodir, add_word):
+def push_commit(repodir, add_word, commit_text=None):
     """
     Create commit and push
     """
-    git = local["git"]
-    with local.cwd(repodir):
-        to_branch = git("symbolic-ref", "--short", "HEAD").strip()
-        from_branch = f"bugfix_typo_{add_word.replace(' ', '_')}"
-        git("commit", "-F", "__commit__.txt")
-        git("push", "origin", f"{to_branch}:{from_branch}")
+    git = _git()["-C", str(repodir)]
+    to_branch = git("symbolic-ref", "--short", "HEAD").strip()
+    from_branch = f"bugfix_typo_{add_word.replace(' ', '_')}"
+    git_commit(git, (), commit_text)
+    git("push", "-q", "--no-verify", "origin", f"{to_branch}:{from_branch}")
     return from_branch, to_branch
 
 
+def undo_push(repodir, from_branch, to_branch):  # pylint: disable=unused-argument
+    """
+    Remove the pushed branch and the commit, leaving the fix staged
+    """
+    from plumbum import ProcessExecutionError
+
+    git = _git()["-C", str(repodir)]
+    try:
+        git("push", "-q", "--no-verify", "origin", "--delete", from_branch)
+        git("reset", "-q", "--soft", "HEAD~1")
+    except ProcessExecutionError:
+        logging.exception("Failed to undo push of %s", from_branch)
+
+
+def amend_commit(repodir, from_branch, to_branch, commit_text=None):
+    """
+    Amend the pushed commit and push it again
+    """
+    git = _git()["-C", str(repodir)]
+    pushed_sha = git("rev-parse", "HEAD").strip()
+    git_commit(git, ("--amend",), commit_text)
+    git(
+        "push",
+        "-q",
+        "--no-verify",
+        f"--force-with-lease=refs/heads/{from_branch}:{pushed_sha}",
+        "origin",
+        f"{to_branch}:{from_branch}",
+    )
+
+
+def git_commit(git, args, commit_text):
+    """
+    Commit with the message piped in or otherwise from the commit template
+    file
+    """
+    commit = git["commit", "-q", "--no-verify", "--no-gpg-sign"][args]
+    if commit_text is None:
+        commit("-F", str(_COMMIT_FILE))
+    else:
+        (commit["-F", "-"] << commit_text)()
+
+
 def show_path(reponame, reposave, path):  # pylint: disable=unused-argument
     """
     Display the issue template directory
     """
+    from plumbum import FG, local
+
     print("Opening editor")
     editor = local[get_editor()]
-    repodir = reposave["repodir"]
-    with local.cwd(repodir):
+    with local.cwd(str(reposave.repodir)):
         _ = editor[str(path)] & FG
 
 
@@ -371,6 +596,8 @@ def add_change_for_repo(repodir):
     print(f"Changing {del_word} to {add_word} in {', '.join(file_paths)}")
     option = make_simple_choice(["save"], "Do you want to save?")
     if option == "save":
+        from meticulous._processrepo import add_repo_save
+
         add_repo_save(repodir, add_word, del_word, file_paths)
 
 
@@ -378,29 +605,55 @@ def get_typo(repodir):
     """
     Look in the staged commit for the typo.
     """
-    git = local["git"]
-    del_lines = []
-    add_lines = []
-    file_paths = []
-    with local.cwd(repodir):
-        output = git("diff", "--staged")
-        for line in output.splitlines():
-            if line.startswith("--- a/"):
-                index = len("--- a/")
-                file_path = line[index:]
-                file_paths.append(file_path)
-        for line in output.splitlines():
-            if line.startswith("-") and not line.startswith("--- "):
-                del_lines.append(line[1:])
-            elif line.startswith("+") and not line.startswith("+++ "):
-                add_lines.append(line[1:])
-    if not del_lines or not add_lines:
+    git = _git()["-C", str(repodir)]
+    diff = git["diff", "--staged", "--no-color", "--diff-filter=M"]
+    file_paths = get_text_changes(diff("--numstat", "-z"))
+    for file_path in file_paths:
+        del_line, add_line = get_changed_lines(diff("--unified=0", "--", file_path))
+        if del_line is not None and add_line is not None:
+            break
+    else:
         print("Could not read diff", file=sys.stderr)
         raise ProcessingFailed()
-    del_words = re.findall("[a-zA-Z]+", del_lines[0])
-    add_words = re.findall("[a-zA-Z]+", add_lines[0])
-    for del_word, add_word in zip(del_words, add_words):
+    del_words = _WORD_RE.finditer(del_line)
+    add_words = _WORD_RE.finditer(add_line)
+    for del_match, add_match in zip(del_words, add_words):
+        del_word = del_match.group()
+        add_word = add_match.group()
         if del_word != add_word:
             return del_word, add_word, file_paths
     print("Could not locate typo", file=sys.stderr)
     raise ProcessingFailed()
+
+
+def get_text_changes(numstat):
+    """
+    Paths from a NUL separated numstat with changed lines, skipping binary
+    files which report "-" and mode only changes which report no lines
+    """
+    file_paths = []
+    for entry in numstat.split("\x00"):
+        if not entry:
+            continue
+        added, deleted, file_path = entry.split("\t", 2)
+        if added.isdigit() and deleted.isdigit() and added + deleted != "00":
+            file_paths.append(file_path)
+    return file_paths
+
+
+def get_changed_lines(output):
+    """
+    Find the first removed and added lines of a diff
+    """
+    del_line = None
+    add_line = None
+    for line in output.splitlines():
+        if line.startswith("--- ") or line.startswith("+++ "):
+            continue
+        if line.startswith("-") and del_line is None:
+            del_line = line[1:]
+        elif line.startswith("+") and add_line is None:
+            add_line = line[1:]
+        if del_line is not None and add_line is not None:
+            break
+    return del_line, add_line
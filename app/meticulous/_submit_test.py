@@ -0,0 +1,230 @@
+"""
+Test cases to check submission of issues and pull requests
+"""
+
+import pathlib
+import tempfile
+from unittest import mock
+
+from github import GithubException
+from plumbum import local
+
+from meticulous._github import PullRequest
+from meticulous._controller import Context
+from meticulous._submit import full_pr_for, get_typo, load_repo_save, submit_batch
+
+
+def make_reposave(repodir):
+    """
+    Repository save for the typo staged by make_staged_repo
+    """
+    return load_repo_save(
+        {
+            "add_word": "the",
+            "del_word": "teh",
+            "file_paths": ["README.md"],
+            "repodir": str(repodir),
+        }
+    )
+
+
+def make_staged_repo():
+    """
+    Create a repository with a staged typo fix and a bare remote to push to
+    """
+    tmpdir = pathlib.Path(tempfile.mkdtemp())
+    remote = tmpdir / "remote.git"
+    repodir = tmpdir / "repo"
+    local["git"]("init", "-q", "--bare", str(remote))
+    local["git"]("init", "-q", str(repodir))
+    git = local["git"]["-C", str(repodir)]
+    git("config", "user.email", "test@example.com")
+    git("config", "user.name", "Test")
+    (repodir / "README.md").write_text("Fix teh typo\n", encoding="utf-8")
+    git("add", "README.md")
+    git("commit", "-q", "-m", "Initial commit")
+    git("remote", "add", "origin", str(remote))
+    (repodir / "README.md").write_text("Fix the typo\n", encoding="utf-8")
+    git("add", "README.md")
+    return repodir, remote
+
+
+def commit_file(repodir, name, data):
+    """
+    Commit a single file leaving anything else staged
+    """
+    git = local["git"]["-C", str(repodir)]
+    (repodir / name).write_bytes(data)
+    git("add", name)
+    git("commit", "-q", "-m", f"Add {name}", "--", name)
+
+
+def test_get_typo():
+    """
+    Ensure a staged typo fix is found
+    """
+    # Setup
+    repodir, _ = make_staged_repo()
+    # Exercise
+    result = get_typo(repodir)
+    # Verify
+    assert result == ("teh", "the", ["README.md"])  # noqa=S101 # nosec
+
+
+def test_get_typo_skips_added_and_deleted_files():
+    """
+    Ensure added and deleted files staged with the fix are ignored
+    """
+    # Setup
+    repodir, _ = make_staged_repo()
+    git = local["git"]["-C", str(repodir)]
+    commit_file(repodir, "0_old.txt", b"remove teh file\n")
+    git("rm", "-q", "0_old.txt")
+    (repodir / "0_new.txt").write_bytes(b"add teh file\n")
+    git("add", "0_new.txt")
+    # Exercise
+    result = get_typo(repodir)
+    # Verify
+    assert result == ("teh", "the", ["README.md"])  # noqa=S101 # nosec
+
+
+def test_get_typo_later_word():
+    """
+    Ensure the first differing word is found past matching words
+    """
+    # Setup
+    repodir, _ = make_staged_repo()
+    git = local["git"]["-C", str(repodir)]
+    git("reset", "-q")
+    (repodir / "README.md").write_bytes(b"Fix teh typo\n")
+    commit_file(repodir, "docs.txt", b"One two three four recieve five\n")
+    (repodir / "docs.txt").write_bytes(b"One two three four receive five\n")
+    git("add", "docs.txt")
+    # Exercise
+    result = get_typo(repodir)
+    # Verify
+    assert result == ("recieve", "receive", ["docs.txt"])  # noqa=S101 # nosec
+
+
+def test_get_typo_skips_binary_and_mode_changes():
+    """
+    Ensure files without changed text lines are skipped even when sorted
+    before the fix
+    """
+    # Setup
+    repodir, _ = make_staged_repo()
+    git = local["git"]["-C", str(repodir)]
+    commit_file(repodir, "0.bin", b"\x00\x01teh")
+    commit_file(repodir, "1.sh", b"echo teh\n")
+    (repodir / "0.bin").write_bytes(b"\x00\x02the")
+    (repodir / "1.sh").chmod(0o755)
+    git("add", "0.bin", "1.sh")
+    # Exercise
+    result = get_typo(repodir)
+    # Verify
+    assert result == ("teh", "the", ["README.md"])  # noqa=S101 # nosec
+
+
+@mock.patch("meticulous._github.create_pr")
+@mock.patch("meticulous._submit.issue_via_api")
+@mock.patch("meticulous._github.get_parent_repo")
+def test_full_pr_for(parent_mock, issue_mock, pr_mock):
+    """
+    Ensure the fix is pushed, amended to close the issue and submitted
+    """
+    # Setup
+    repodir, remote = make_staged_repo()
+    reposave = make_reposave(repodir)
+    issue_mock.return_value = 7
+    pr_mock.return_value = PullRequest(number=8, html_url="http://example.com/8")
+    # Exercise
+    result = full_pr_for("repo", reposave)
+    # Verify
+    message = local["git"](
+        "-C", str(remote), "log", "-1", "--format=%B", "bugfix_typo_the"
+    )
+    assert "Closes #7" in message  # noqa=S101 # nosec
+    title = pr_mock.call_args[0][1]
+    assert title == "docs: Fix simple typo, teh -> the"  # noqa=S101 # nosec
+    assert pr_mock.call_args[1]["repo"] is parent_mock.return_value  # noqa=S101 # nosec
+    assert result == "Created PR #8 view at http://example.com/8"  # noqa=S101 # nosec
+
+
+@mock.patch("meticulous._submit.issue_via_api")
+@mock.patch("meticulous._github.get_parent_repo")
+def test_full_pr_for_issue_failure(_, issue_mock):
+    """
+    Ensure a failed issue reports the failure and removes the pushed branch
+    leaving the fix staged
+    """
+    # Setup
+    repodir, remote = make_staged_repo()
+    reposave = make_reposave(repodir)
+    issue_mock.side_effect = GithubException(502, "Bad Gateway", {})
+    # Exercise
+    result = full_pr_for("repo", reposave)
+    # Verify
+    assert result == "Failed to create pr for repo."  # noqa=S101 # nosec
+    branches = local["git"]("-C", str(remote), "branch", "--list", "bugfix_typo_*")
+    assert branches == ""  # noqa=S101 # nosec
+    staged = local["git"]("-C", str(repodir), "diff", "--staged", "--name-only")
+    assert staged.split() == ["README.md"]  # noqa=S101 # nosec
+
+
+@mock.patch("meticulous._submit.issue_via_api")
+@mock.patch("meticulous._github.get_parent_repo")
+def test_full_pr_for_push_failure(_, issue_mock):
+    """
+    Ensure a failed push reports the commit failure
+    """
+    # Setup
+    repodir, _ = make_staged_repo()
+    local["git"]("-C", str(repodir), "remote", "set-url", "origin", "/nonexistent")
+    reposave = make_reposave(repodir)
+    issue_mock.return_value = 7
+    # Exercise
+    result = full_pr_for("repo", reposave)
+    # Verify
+    assert result == "Failed to commit for repo."  # noqa=S101 # nosec
+
+
+@mock.patch("meticulous._submit.get_cached_json_value")
+def test_submit_batch(saves_mock):
+    """
+    Ensure repositories are split into plain and full pull requests, queued
+    in a single call and that unknown repositories are skipped
+    """
+    # Setup
+    complex_dir = pathlib.Path(tempfile.mkdtemp())
+    (complex_dir / "CONTRIBUTING.md").write_text(
+        "We expect an issue first.\n", encoding="utf-8"
+    )
+    plain_dir = pathlib.Path(tempfile.mkdtemp())
+    complex_save = {"repodir": str(complex_dir)}
+    plain_save = {"repodir": str(plain_dir)}
+    for save in (complex_save, plain_save):
+        save.update({"add_word": "the", "del_word": "teh", "file_paths": ["a"]})
+    saves_mock.return_value = {"complex": complex_save, "plain": plain_save}
+    controller = mock.Mock()
+    taskjson = {"reponames": ["complex", "missing", "plain"]}
+    handler = submit_batch(Context(controller=controller, taskjson=taskjson))
+    # Exercise
+    handler()
+    # Verify
+    controller.add_many.assert_called_once_with(
+        [
+            {
+                "name": "full_pr",
+                "interactive": False,
+                "reponame": "complex",
+                "reposave": complex_save,
+            },
+            {
+                "name": "plain_pr",
+                "interactive": False,
+                "reponame": "plain",
+                "reposave": plain_save,
+            },
+        ]
+    )
+    controller.add.assert_not_called()
@@ -70,6 +70,20 @@ def display_and_check_files(path):
     return suggest_issue
 
 
+def check_files(path):
+    """
+    Scan files looking for the word or word start "expect" without display,
+    stopping at the first match
+    """
+    regex = re.compile("expect", re.I)
+    if path.is_dir():
+        return any(check_files(fpath) for fpath in path.iterdir())
+    if not path.is_file():
+        return False
+    with io.open(path, "r", encoding="utf-8") as fobj:
+        return any(regex.search(line) for line in fobj)
+
+
 if __name__ == "__main__":
     init()
     display_repo_intro(pathlib.Path(sys.argv[1]))